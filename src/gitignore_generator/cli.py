@@ -20,6 +20,13 @@ from .prompt import show_summary
 from .prompt import show_template_search_results
 from .templates import TemplateManager
 
+# OS display names mapped to their GitHub template names
+_OS_TO_TEMPLATE = {
+    'Windows': 'Global/Windows',
+    'macOS': 'Global/macOS',
+    'Linux': 'Global/Linux'
+}
+
 
 class GitignoreGeneratorCLI:
     """Main CLI application class."""
@@ -43,12 +50,7 @@ class GitignoreGeneratorCLI:
         Returns:
             List of template names to fetch
         """
-        mapping = {
-            'Windows': 'Global/Windows',
-            'macOS': 'Global/macOS',
-            'Linux': 'Global/Linux'
-        }
-        return [mapping[os] for os in os_list if os in mapping]
+        return [_OS_TO_TEMPLATE[os] for os in os_list if os in _OS_TO_TEMPLATE]
 
     def _fetch_and_resolve_templates(self, template_names: List[str]) -> List[Tuple[str, str]]:
         """
@@ -59,45 +61,45 @@ class GitignoreGeneratorCLI:
         Returns:
             List of (template_name, content) tuples
         """
-        resolved_templates = []
+        resolved_names = []
         
+        # Resolve every name first so disambiguation prompts stay sequential
         for template_name in template_names:
             # Try exact match first
             resolved = self.template_manager.resolve_template(template_name)
             
-            if resolved:
-                # Found single match
-                content = self.template_manager.get_template_content(resolved)
-                if content:
-                    resolved_templates.append((resolved, content))
+            if not resolved:
+                # Try searching
+                matches = self.template_manager.search_templates(template_name)
+                
+                if not matches:
+                    show_message(f"Template not found: {template_name}", "warning")
+                    continue
+                
+                if len(matches) == 1:
+                    # Exactly one match
+                    resolved = matches[0]
                 else:
-                    show_message(f"Failed to fetch template: {template_name}", "error")
-                continue
-            
-            # Try searching
-            matches = self.template_manager.search_templates(template_name)
+                    # Multiple matches - ask user to choose
+                    resolved = show_template_search_results(matches, template_name)
+                    if not resolved:
+                        continue
             
-            if not matches:
-                show_message(f"Template not found: {template_name}", "warning")
-                continue
-            
-            if len(matches) == 1:
-                # Exactly one match
-                resolved = matches[0]
-                content = self.template_manager.get_template_content(resolved)
-                if content:
-                    resolved_templates.append((resolved, content))
-                else:
-                    show_message(f"Failed to fetch template: {resolved}", "error")
+            resolved_names.append(resolved)
+        
+        if not resolved_names:
+            return []
+        
+        # Cached templates are read directly, the rest are downloaded concurrently
+        contents = self.template_manager.get_template_contents(resolved_names)
+        
+        resolved_templates = []
+        for resolved in resolved_names:
+            content = contents.get(resolved)
+            if content:
+                resolved_templates.append((resolved, content))
             else:
-                # Multiple matches - ask user to choose
-                selected = show_template_search_results(matches, template_name)
-                if selected:
-                    content = self.template_manager.get_template_content(selected)
-                    if content:
-                        resolved_templates.append((selected, content))
-                    else:
-                        show_message(f"Failed to fetch template: {selected}", "error")
+                show_message(f"Failed to fetch template: {resolved}", "error")
         
         return resolved_templates
 
@@ -152,9 +154,9 @@ class GitignoreGeneratorCLI:
             return 1
         
         # Step 7: Show dry-run preview
+        existing = None
         if gitignore_exists and merge_strategy == 'append':
-            with open(self.generator.output_path, 'r') as f:
-                existing = f.read()
+            existing = self.generator.output_path.read_text(encoding='utf-8')
             print(self.generator.diff_templates(existing, self.selected_templates))
         
         if not prompt_dry_run(self.selected_templates):
@@ -164,7 +166,9 @@ class GitignoreGeneratorCLI:
         # Step 8: Generate .gitignore
         success, message = self.generator.generate(
             self.selected_templates,
-            merge_strategy=merge_strategy
+            merge_strategy=merge_strategy,
+            existing_content=existing,
+            exists=gitignore_exists
         )
         
         if success:
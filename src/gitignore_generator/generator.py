@@ -3,12 +3,36 @@
 Handles combining templates, removing duplicates, and preserving existing content.
 """
 
+import io
+import os
 import re
+import sys
+from functools import lru_cache
 from pathlib import Path
+from typing import FrozenSet
 from typing import List
 from typing import Optional
+from typing import Set
+from typing import TextIO
 from typing import Tuple
 
+# A rule is any non-empty line whose first non-blank character is not '#'.
+# Surrounding whitespace (including a trailing '\r') is excluded from the capture.
+_RULE_RE = re.compile(r'^[^\S\n]*([^#\s](?:[^\n]*\S)?)[^\S\n]*$', re.MULTILINE)
+
+# Lines starting with C-style comment markers, which .gitignore does not support
+_SYNTAX_RE = re.compile(r'^[^\S\n]*(?:(?P<slash>//)|/\*)', re.MULTILINE)
+
+
+@lru_cache(maxsize=256)
+def _extract_rules_cached(content: str) -> FrozenSet[str]:
+    """
+    Extract the unique rules of a template, memoized by content.
+    Rules are interned so identical rules from different templates share
+    one string object and set operations compare by identity first.
+    """
+    return frozenset(map(sys.intern, _RULE_RE.findall(content)))
+
 
 class GitignoreGenerator:
     """Generates and merges .gitignore files from templates."""
@@ -40,12 +64,7 @@ class GitignoreGenerator:
         decorator = "#" * len(header_line)
         
         # Create section
-        section = decorator + "\n"
-        section += header_line + "\n"
-        section += decorator + "\n"
-        section += content.rstrip() + "\n"
-        
-        return section
+        return f"{decorator}\n{header_line}\n{decorator}\n{content.rstrip()}\n"
 
     def _normalize_template_name(self, name: str) -> str:
         """
@@ -55,21 +74,14 @@ class GitignoreGenerator:
             'Python' -> 'Python'
             'community/Python/JupyterNotebooks' -> 'JupyterNotebooks'
         """
-        parts = name.split('/')
-        return parts[-1]
+        return name.rpartition('/')[2] or name
 
-    def _extract_rules(self, content: str) -> set:
+    def _extract_rules(self, content: str) -> FrozenSet[str]:
         """
         Extract non-comment, non-empty lines as unique rules.
         Used for duplicate detection.
         """
-        rules = set()
-        for line in content.split('\n'):
-            stripped = line.strip()
-            # Skip comments and empty lines
-            if stripped and not stripped.startswith('#'):
-                rules.add(stripped)
-        return rules
+        return _extract_rules_cached(content)
 
     def merge_templates(
         self,
@@ -86,75 +98,92 @@ class GitignoreGenerator:
         Returns:
             Merged .gitignore content
         """
-        merged = ""
-        all_rules = set()
+        buffer = io.StringIO()
+        self.write_templates(buffer, templates, preserve_existing, existing_content)
+        return buffer.getvalue()
+
+    def write_templates(
+        self,
+        out: TextIO,
+        templates: List[Tuple[str, str]],
+        preserve_existing: bool = False,
+        existing_content: Optional[str] = None
+    ) -> None:
+        """
+        Stream merged .gitignore content section by section to a text stream.
+        Args:
+            out: Writable text stream (e.g. an open file)
+            templates: List of (template_name, content) tuples
+            preserve_existing: If True, preserve existing rules from existing_content
+            existing_content: Content of existing .gitignore (if any)
+        """
+        all_rules: Set[str] = set()
         
         # Preserve existing rules if requested
         if preserve_existing and existing_content:
-            existing_rules = self._extract_rules(existing_content)
-            all_rules.update(existing_rules)
+            all_rules |= self._extract_rules(existing_content)
             
             # Add existing content (without our markers) if it doesn't have them
             if "##### Project Specific #####" not in existing_content:
-                merged += existing_content.rstrip() + "\n\n"
+                out.write(existing_content.rstrip() + "\n\n")
         
         # Process each template
         for template_name, content in templates:
             template_rules = self._extract_rules(content)
             
-            # Filter out duplicate rules
-            new_rules = template_rules - all_rules
-            all_rules.update(template_rules)
+            # Only add section if it has new rules
+            if template_rules <= all_rules:
+                continue
             
-            if new_rules:  # Only add section if it has new rules
-                section = self.template_to_section(template_name, content)
-                merged += section + "\n"
+            # Written verbatim: .gitignore is last-match-wins, so dropping a
+            # repeated rule that follows a '!' negation would change what is ignored
+            all_rules |= template_rules
+            out.write(self.template_to_section(template_name, content))
+            out.write("\n")
         
         # Add marker for user's additional rules
         this_repo_header = "##### Project Specific #####"
         decorator = "#" * len(this_repo_header)
-        merged += decorator + "\n"
-        merged += this_repo_header + "\n"
-        merged += decorator + "\n"
-        merged += "# Add your project-specific rules below this line\n"
-        
-        return merged.rstrip() + "\n"
+        out.write(f"{decorator}\n{this_repo_header}\n{decorator}\n")
+        out.write("# Add your project-specific rules below this line\n")
 
     def generate(
         self,
         templates: List[Tuple[str, str]],
-        merge_strategy: str = 'create'
+        merge_strategy: str = 'create',
+        existing_content: Optional[str] = None,
+        exists: Optional[bool] = None
     ) -> Tuple[bool, str]:
         """
         Generate .gitignore file.
         Args:
             templates: List of (template_name, content) tuples
             merge_strategy: 'create', 'overwrite', or 'append'
+            existing_content: Already-read content of the existing .gitignore,
+                used in append mode instead of reading the file again
+            exists: Whether the output file exists, if the caller already checked
         Returns:
             Tuple of (success: bool, message: str)
         """
         if not templates:
             return False, "No templates provided"
         
-        # Check if file exists
-        exists = self.output_path.exists()
+        # Check if file exists, unless the caller already did
+        if exists is None:
+            exists = os.path.exists(self.output_path)
         
         if exists and merge_strategy == 'cancel':
             return False, "Operation cancelled"
         
         try:
+            existing = None
             if exists and merge_strategy == 'append':
-                # Read existing content
-                with open(self.output_path, 'r') as f:
-                    existing = f.read()
-                merged = self.merge_templates(templates, preserve_existing=True, existing_content=existing)
-            else:
-                # Create new or overwrite
-                merged = self.merge_templates(templates, preserve_existing=False)
+                existing = existing_content
+                if existing is None:
+                    # Read existing content before the file is truncated for writing
+                    existing = self.output_path.read_text(encoding='utf-8')
             
-            # Write file
-            with open(self.output_path, 'w') as f:
-                f.write(merged)
+            self._write_output(templates, existing)
             
             action = "Created" if not exists or merge_strategy == 'overwrite' else "Updated"
             return True, f"{action} .gitignore successfully!"
@@ -162,6 +191,47 @@ class GitignoreGenerator:
         except Exception as e:
             return False, f"Error writing .gitignore: {e}"
 
+    def _write_output(self, templates: List[Tuple[str, str]], existing: Optional[str]) -> None:
+        """
+        Stream merged sections into a temporary file next to the output, then
+        rename it over the output. A failure midway leaves the existing
+        .gitignore untouched instead of truncated.
+        Args:
+            templates: List of (template_name, content) tuples
+            existing: Existing content to preserve, or None
+        """
+        import tempfile  # Only needed when writing
+
+        # Replace the file a symlinked .gitignore points to, not the link
+        target = os.path.realpath(self.output_path)
+        try:
+            mode = os.stat(target).st_mode & 0o777
+        except OSError:
+            # New file: the permissions open() would have used
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(target), prefix=".gitignore.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                self.write_templates(
+                    f,
+                    templates,
+                    preserve_existing=existing is not None,
+                    existing_content=existing
+                )
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, target)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
     def validate_syntax(self, content: str) -> Tuple[bool, List[str]]:
         """
         Basic validation of .gitignore syntax.
@@ -171,21 +241,18 @@ class GitignoreGenerator:
             Tuple of (is_valid: bool, warnings: List[str])
         """
         warnings = []
+        line_num = 1
+        last_pos = 0
         
-        for line_num, line in enumerate(content.split('\n'), 1):
-            stripped = line.strip()
+        # Check for common issues
+        for match in _SYNTAX_RE.finditer(content):
+            line_num += content.count('\n', last_pos, match.start())
+            last_pos = match.start()
             
-            # Check for common issues
-            if stripped.startswith('//'):
+            if match.group('slash'):
                 warnings.append(f"Line {line_num}: C-style comments not supported, use '#'")
-            
-            if stripped.startswith('/*'):
+            else:
                 warnings.append(f"Line {line_num}: Consider using '#' for comments")
-            
-            # Check for suspicious patterns
-            if '**' in stripped and not stripped.startswith('#'):
-                # This is OK but might indicate confusion with glob patterns
-                pass
         
         return len(warnings) == 0, warnings
 
@@ -199,10 +266,7 @@ class GitignoreGenerator:
             Diff summary as string
         """
         existing_rules = self._extract_rules(existing_content)
-        new_rules = set()
-        
-        for _, content in new_templates:
-            new_rules.update(self._extract_rules(content))
+        new_rules = set().union(*(self._extract_rules(content) for _, content in new_templates))
         
         duplicates = existing_rules & new_rules
         additions = new_rules - existing_rules
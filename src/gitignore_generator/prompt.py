@@ -3,14 +3,22 @@ User interaction and prompting utilities.
 Handles OS selection, template search, merging strategy, and confirmation.
 """
 
-import platform
+import sys
+from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Tuple
 
+_AVAILABLE_OS = ('Windows', 'macOS', 'Linux')
+
+# Case-insensitive lookup of OS names
+_OS_LOWER_MAP = {os.lower(): os for os in _AVAILABLE_OS}
+
 
 def get_platform_name() -> str:
     """Get the current platform name."""
+    import platform  # Only needed once per run, keep it off the import path
+    
     system = platform.system()
     if system == 'Windows':
         return 'Windows'
@@ -53,10 +61,6 @@ def prompt_os_selection() -> List[str]:
     Returns list of selected OS names.
     """
     detected_os = get_platform_name()
-    available_os = ['Windows', 'macOS', 'Linux']
-    
-    # Create case-insensitive mapping
-    os_mapping = {os.lower(): os for os in available_os}
     
     print(f"\n=== Operating System Selection ===")
     print(f"Detected: {detected_os}\n")
@@ -79,15 +83,15 @@ def prompt_os_selection() -> List[str]:
             invalid = []
             
             for user_os in user_selections:
-                if user_os in os_mapping:
-                    selected.append(os_mapping[user_os])
+                if user_os in _OS_LOWER_MAP:
+                    selected.append(_OS_LOWER_MAP[user_os])
                 else:
                     invalid.append(user_os)
         
         # Validate
         if invalid:
             print(f"Invalid options: {', '.join(invalid)}")
-            print(f"Available: {', '.join(available_os)}")
+            print(f"Available: {', '.join(_AVAILABLE_OS)}")
             continue
         
         if not selected:
@@ -111,6 +115,8 @@ def prompt_and_resolve_languages(template_manager) -> List[str]:
     print("Or leave blank to skip.\n")
     
     languages = []
+    # Unambiguous resolutions keyed by lowercased input; None means no template matched
+    seen: Dict[str, Optional[str]] = {}
     while True:
         try:
             user_input = input("> Enter language (or press Enter to finish): ").strip()
@@ -121,33 +127,42 @@ def prompt_and_resolve_languages(template_manager) -> List[str]:
             break
         
         lang = user_input.strip()
+        key = lang.lower()
         
-        # Try to resolve immediately
-        resolved = template_manager.resolve_template(lang)
-        
-        if resolved:
-            if resolved not in languages:
-                languages.append(resolved)
-                show_message(f"Added: {resolved}", "success")
-        else:
-            # Try searching for matches
-            matches = template_manager.search_templates(lang)
-            
-            if not matches:
+        if key in seen:
+            # Same language entered again - skip the lookup
+            selected = seen[key]
+            if selected is None:
                 show_message(f"Template not found for: {lang}", "warning")
                 continue
+        else:
+            # Try to resolve immediately
+            selected = template_manager.resolve_template(lang)
             
-            if len(matches) == 1:
-                # Exactly one match - add it
-                if matches[0] not in languages:
-                    languages.append(matches[0])
-                    show_message(f"Added: {matches[0]}", "success")
+            if not selected:
+                # Try searching for matches
+                matches = template_manager.search_templates(lang)
+                
+                if not matches:
+                    seen[key] = None
+                    show_message(f"Template not found for: {lang}", "warning")
+                    continue
+                
+                if len(matches) == 1:
+                    # Exactly one match - add it
+                    selected = matches[0]
+                    seen[key] = selected
+                else:
+                    # Multiple matches - reuse selection UI (not cached, the user may pick differently)
+                    selected = show_template_search_results(matches, lang)
+                    if not selected:
+                        continue
             else:
-                # Multiple matches - reuse selection UI
-                selected = show_template_search_results(matches, lang)
-                if selected and selected not in languages:
-                    languages.append(selected)
-                    show_message(f"Added: {selected}", "success")
+                seen[key] = selected
+        
+        if selected not in languages:
+            languages.append(selected)
+            show_message(f"Added: {selected}", "success")
     
     return languages
 
@@ -159,6 +174,8 @@ def prompt_additional_templates(template_manager) -> List[str]:
     """
     print("\n=== Additional Templates Search ===")
     templates = []
+    # Unambiguous search results keyed by lowercased query; None means nothing matched
+    seen: Dict[str, Optional[str]] = {}
     while True:
         try:
             search_query = input("> Search for template (or press Enter to skip): ").strip()
@@ -168,15 +185,26 @@ def prompt_additional_templates(template_manager) -> List[str]:
         if not search_query:
             break
         
-        matches = template_manager.search_templates(search_query)
-        if not matches:
-            show_message(f"No templates found for '{search_query}'", "warning")
-            continue
-        
-        if len(matches) == 1:
-            selected = matches[0]
+        key = search_query.lower()
+        if key in seen:
+            # Same query entered again - skip the search
+            selected = seen[key]
+            if selected is None:
+                show_message(f"No templates found for '{search_query}'", "warning")
+                continue
         else:
-            selected = show_template_search_results(matches, search_query)
+            matches = template_manager.search_templates(search_query)
+            if not matches:
+                seen[key] = None
+                show_message(f"No templates found for '{search_query}'", "warning")
+                continue
+            
+            if len(matches) == 1:
+                selected = matches[0]
+                seen[key] = selected
+            else:
+                # Not cached, the user may pick differently next time
+                selected = show_template_search_results(matches, search_query)
         
         if selected:
             templates.append(selected)
@@ -198,12 +226,13 @@ def show_template_search_results(results: List[str], query: str) -> Optional[str
         print(f"✗ No templates found for '{query}'")
         return None
     
-    print(f"\nFound {len(results)} template(s) for '{query}':")
+    buf = [f"\nFound {len(results)} template(s) for '{query}':"]
     for i, template in enumerate(results[:10], 1):  # Limit to 10 results
-        print(f"  {i}. {template}")
+        buf.append(f"  {i}. {template}")
     
     if len(results) > 10:
-        print(f"  ... and {len(results) - 10} more")
+        buf.append(f"  ... and {len(results) - 10} more")
+    sys.stdout.write("\n".join(buf) + "\n")
     
     while True:
         try:
@@ -266,31 +295,31 @@ def show_summary(
     Returns:
         True if user confirms, False if user wants to cancel
     """
-    print("\n" + "="*50)
-    print("SUMMARY OF SELECTED TEMPLATES")
-    print("="*50)
+    # Build the whole summary and write it at once
+    buf = ["\n" + "="*50, "SUMMARY OF SELECTED TEMPLATES", "="*50]
     
     if selected_os:
-        print(f"\nOperating Systems ({len(selected_os)}):")
+        buf.append(f"\nOperating Systems ({len(selected_os)}):")
         for os in selected_os:
-            print(f"  • {os}")
+            buf.append(f"  • {os}")
     
     if selected_languages:
-        print(f"\nProgramming Languages ({len(selected_languages)}):")
+        buf.append(f"\nProgramming Languages ({len(selected_languages)}):")
         for lang in selected_languages:
             # Show readable name
-            display_name = lang.split('/')[-1] if '/' in lang else lang
-            print(f"  • {display_name}")
+            display_name = lang.rpartition('/')[2] or lang
+            buf.append(f"  • {display_name}")
     
     if additional_templates:
-        print(f"\nAdditional Templates ({len(additional_templates)}):")
+        buf.append(f"\nAdditional Templates ({len(additional_templates)}):")
         for template in additional_templates:
-            display_name = template.split('/')[-1] if '/' in template else template
-            print(f"  • {display_name}")
+            display_name = template.rpartition('/')[2] or template
+            buf.append(f"  • {display_name}")
     
     total = len(selected_os) + len(selected_languages) + len(additional_templates)
-    print(f"\nTotal templates to generate: {total}")
-    print("="*50)
+    buf.append(f"\nTotal templates to generate: {total}")
+    buf.append("="*50)
+    sys.stdout.write("\n".join(buf) + "\n")
     
     return prompt_yes_no("\nProceed with generation", default=True)
 
@@ -303,27 +332,28 @@ def prompt_dry_run(template_contents: List[Tuple[str, str]]) -> bool:
     Returns:
         True if user wants to continue, False to cancel
     """
-    print("\n" + "="*50)
-    print("PREVIEW OF GENERATED .gitignore")
-    print("="*50)
+    # Build the whole preview and write it at once
+    buf = ["\n" + "="*50, "PREVIEW OF GENERATED .gitignore", "="*50]
     
     total_lines = 0
     for template_name, content in template_contents:
-        lines = len(content.strip().split('\n'))
+        lines = content.strip().count('\n') + 1
         total_lines += lines
-        print(f"\n[{template_name}] - {lines} lines")
+        buf.append(f"\n[{template_name}] - {lines} lines")
     
-    print(f"\n... (showing structure, total {total_lines} lines)")
-    print("\nFirst template preview (max 15 lines):")
-    print("-" * 50)
+    buf.append(f"\n... (showing structure, total {total_lines} lines)")
+    buf.append("\nFirst template preview (max 15 lines):")
+    buf.append("-" * 50)
     if template_contents:
         _, content = template_contents[0]
-        lines = content.strip().split('\n')[:15]
-        for line in lines:
-            print(line)
-        if len(content.strip().split('\n')) > 15:
-            print("...")
-    print("-" * 50)
+        content = content.strip()
+        # Split off at most 15 lines, the remainder stays in one string
+        preview_lines = content.split('\n', 15)
+        buf.extend(preview_lines[:15])
+        if len(preview_lines) > 15:
+            buf.append("...")
+    buf.append("-" * 50)
+    sys.stdout.write("\n".join(buf) + "\n")
     
     return prompt_yes_no("\nProceed with writing .gitignore", default=True)
 
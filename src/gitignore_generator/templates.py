@@ -4,19 +4,26 @@ Uses GitHub API to browse templates and downloads them on-demand.
 Local caching to ~/.cache/gitignore-generator/ to minimize network calls.
 """
 
+import gzip
 import json
 import os
-import urllib.error
-import urllib.request
-from datetime import datetime
-from datetime import timedelta
+import pickle
+import re
+import threading
+import time
+from bisect import bisect_right
 from pathlib import Path
+from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
+
+from . import __version__
 
 GITHUB_API_BASE = "https://api.github.com/repos/github/gitignore/contents"
 GITHUB_RAW_BASE = "https://raw.githubusercontent.com/github/gitignore/main"
+GITHUB_RAW_HOST = 'raw.githubusercontent.com'
 
 # Cache location
 if os.name == 'nt':  # Windows
@@ -24,124 +31,409 @@ if os.name == 'nt':  # Windows
 else:  # macOS, Linux
     CACHE_DIR = Path.home() / '.cache' / 'gitignore-generator'
 
-MANIFEST_FILE = CACHE_DIR / 'manifest.json'
+# Pickled rather than JSON: loading it is on every CLI start-up path
+MANIFEST_FILE = CACHE_DIR / 'manifest.pkl'
+LEGACY_MANIFEST_FILE = CACHE_DIR / 'manifest.json'
 TEMPLATES_CACHE_DIR = CACHE_DIR / 'templates'
 CACHE_VALIDITY_DAYS = 7
+TEMPLATE_COMPRESS_LEVEL = 3  # Templates are small text, higher levels gain little
+
+# Network settings
+REQUEST_TIMEOUT = 5
+MAX_FETCH_WORKERS = 8  # Parallel GitHub requests when crawling or downloading
+MAX_REDIRECTS = 3
+REQUEST_HEADERS = {
+    'Accept': 'application/vnd.github+json',
+    'User-Agent': f'gitignore-generator/{__version__}',
+    'Connection': 'keep-alive',
+}
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """
+    Write data to path atomically via a temporary file and rename.
+    An interrupted write leaves the previous file intact instead of a truncated one.
+    """
+    import tempfile  # Only needed when writing the cache
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _resolve_host(host: str) -> None:
+    """
+    Resolve a host ahead of time so the OS resolver cache is warm when the
+    first connection to it is opened. Failures are left for that connection to report.
+    """
+    import socket
+    import urllib.request
+
+    proxy = urllib.request.getproxies().get('https')
+    if proxy and not urllib.request.proxy_bypass(host):
+        return  # The proxy resolves the host
+    try:
+        socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+    except OSError:
+        pass
 
 
 class TemplateManager:
     """Manages fetching, caching, and searching gitignore templates."""
 
+    # Idle keep-alive connections by host, shared by all instances and threads
+    # so they survive CLI re-entry and are reused across fetch batches.
+    # http.client connections are not thread-safe, so each request checks one
+    # out of the pool and returns it when done.
+    _idle_connections: Dict[str, List[Any]] = {}
+    _pool_lock = threading.Lock()
+    _dns_prewarm_started = False
+
     def __init__(self):
         """Initialize the template manager."""
         self._manifest: Optional[Dict] = None
-        self._ensure_cache_dir()
+        # Name lookups, built from the manifest on first use
+        self._name_index_loaded = False
+        self._names: List[str] = []
+        self._names_lower: List[str] = []
+        self._exact_lower: Dict[str, str] = {}
+        self._names_blob = ''
+        self._name_offsets: List[int] = []
+        self._by_name: Dict[str, str] = {}
+        # Contents already returned in this session, by template name
+        self._content_cache: Dict[str, str] = {}
+        # Cache directories are created on first write, not at start-up
+        self._cache_dir_ready = False
+
+    @classmethod
+    def _prewarm_dns(cls) -> None:
+        """
+        Resolve the template download host in the background, once per process.
+        The lookup overlaps the manifest crawl and the prompts that follow it.
+        """
+        if cls._dns_prewarm_started:
+            return
+        cls._dns_prewarm_started = True
+        threading.Thread(target=_resolve_host, args=(GITHUB_RAW_HOST,), daemon=True).start()
 
     def _ensure_cache_dir(self) -> None:
         """Create cache directories if they don't exist."""
+        if self._cache_dir_ready:
+            return
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
         TEMPLATES_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self._cache_dir_ready = True
 
-    def _is_cache_valid(self) -> bool:
-        """Check if cached manifest is still valid."""
-        if not MANIFEST_FILE.exists():
-            return False
+    def _is_cache_valid(self, cache_file: Optional[Path] = None) -> bool:
+        """Check if a cached file (the manifest by default) is still valid."""
+        if cache_file is None:
+            cache_file = MANIFEST_FILE
+        try:
+            age = time.time() - cache_file.stat().st_mtime
+        except OSError:
+            return False  # Missing or unreadable
+        return age < CACHE_VALIDITY_DAYS * 86400
+
+    def _new_connection(self, host: str):
+        """Open a new keep-alive HTTPS connection to host."""
+        import http.client
+        import urllib.request
+        from urllib.parse import unquote
+        from urllib.parse import urlsplit
+        
+        # Honor HTTPS proxy settings from the environment, as urllib did
+        proxy = urllib.request.getproxies().get('https')
+        proxy_parts = urlsplit(proxy) if proxy and not urllib.request.proxy_bypass(host) else None
+        if proxy_parts is not None and proxy_parts.hostname:
+            conn = http.client.HTTPSConnection(
+                proxy_parts.hostname, proxy_parts.port or 80, timeout=REQUEST_TIMEOUT
+            )
+            tunnel_headers = {}
+            if proxy_parts.username:
+                import base64
+
+                credentials = f"{unquote(proxy_parts.username)}:{unquote(proxy_parts.password or '')}"
+                token = base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+                tunnel_headers['Proxy-Authorization'] = f"Basic {token}"
+            conn.set_tunnel(host, headers=tunnel_headers)
+            return conn
+        return http.client.HTTPSConnection(host, timeout=REQUEST_TIMEOUT)
+
+    def _checkout_connection(self, host: str):
+        """Take an idle connection to host from the pool, or open a new one."""
+        with self._pool_lock:
+            idle = self._idle_connections.get(host)
+            if idle:
+                return idle.pop()
+        return self._new_connection(host)
+
+    def _release_connection(self, host: str, conn) -> None:
+        """Return a connection to the pool, closing it if enough are already idle."""
+        with self._pool_lock:
+            idle = self._idle_connections.setdefault(host, [])
+            if len(idle) < MAX_FETCH_WORKERS:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _request(
+        self,
+        host: str,
+        path: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[Any, bytes]:
+        """
+        Send a GET over a pooled connection and read the full response.
+        Returns a (response, body) tuple.
+        """
+        request_headers = dict(REQUEST_HEADERS, **headers) if headers else REQUEST_HEADERS
+        conn = self._checkout_connection(host)
+        while True:
+            # A connection that already has a socket was kept alive from an earlier request
+            reused = conn.sock is not None
+            try:
+                conn.request('GET', path, headers=request_headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (ConnectionResetError, BrokenPipeError):
+                # Includes RemoteDisconnected: GitHub may have closed an idle
+                # keep-alive socket, retry once on a fresh connection
+                conn.close()
+                if not reused:
+                    raise
+                conn = self._new_connection(host)
+                continue
+            except BaseException:
+                # Timeouts and other failures are not retried
+                conn.close()
+                raise
+            
+            self._release_connection(host, conn)
+            return response, body
+
+    def _fetch_response(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Optional[Tuple[Any, bytes]]:
+        """
+        Fetch a URL from GitHub, following redirects, with error handling.
+        Returns the final (response, body) tuple, or None if the request failed.
+        """
+        # Deferred: http.client loads ssl/email, which offline
+        # paths (cache hits, --help, --version) never need
+        import http.client
+        from urllib.parse import urljoin
+        from urllib.parse import urlsplit
         
-        mod_time = datetime.fromtimestamp(MANIFEST_FILE.stat().st_mtime)
-        age = datetime.now() - mod_time
-        return age < timedelta(days=CACHE_VALIDITY_DAYS)
-
-    def _fetch_from_api(self, url: str) -> Optional[str]:
-        """Fetch content from GitHub API with error handling."""
         try:
-            with urllib.request.urlopen(url, timeout=5) as response:
-                return response.read().decode('utf-8')
-        except urllib.error.URLError as e:
+            for _ in range(MAX_REDIRECTS + 1):
+                parts = urlsplit(url)
+                path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+                response, body = self._request(parts.netloc, path, headers)
+                
+                location = response.getheader('Location')
+                if response.status in (301, 302, 303, 307, 308) and location:
+                    url = urljoin(url, location)
+                    continue
+                return response, body
+            
+            print(f"Error fetching from GitHub: too many redirects for {url}")
+            return None
+        except (http.client.HTTPException, OSError) as e:
             print(f"Network error: {e}. Check your internet connection.")
             return None
         except Exception as e:
             print(f"Error fetching from GitHub: {e}")
             return None
 
-    def _load_manifest(self) -> Dict:
-        """Load manifest from cache or fetch from API."""
-        if self._is_cache_valid():
-            try:
-                with open(MANIFEST_FILE, 'r') as f:
+    def _fetch_bytes(self, url: str) -> Optional[bytes]:
+        """Fetch a raw response body from GitHub with error handling."""
+        result = self._fetch_response(url)
+        if result is None:
+            return None
+        
+        response, body = result
+        if response.status != 200:
+            print(f"Error fetching from GitHub: HTTP {response.status} {response.reason}")
+            return None
+        return body
+
+    def _fetch_from_api(self, url: str) -> Optional[str]:
+        """Fetch text content from GitHub API with error handling."""
+        body = self._fetch_bytes(url)
+        return body.decode('utf-8') if body is not None else None
+
+    def _fetch_listing(self, url: str) -> Optional[List[Dict]]:
+        """
+        Fetch a GitHub API directory listing.
+        The body is parsed straight from bytes, without an intermediate str copy.
+        """
+        return self._parse_listing(self._fetch_bytes(url))
+
+    @staticmethod
+    def _parse_listing(body: Optional[bytes]) -> Optional[List[Dict]]:
+        """Parse a directory listing body, or return None if it is missing or invalid."""
+        if not body:
+            return None
+        try:
+            listing: List[Dict] = json.loads(body)
+        except json.JSONDecodeError:
+            return None
+        return listing
+
+    def _migrate_legacy_manifest(self) -> None:
+        """Convert a manifest.json cache left by older versions to the pickle format."""
+        if not LEGACY_MANIFEST_FILE.exists():
+            return
+
+        try:
+            if not MANIFEST_FILE.exists():
+                with open(LEGACY_MANIFEST_FILE, 'r') as f:
                     self._manifest = json.load(f)
-                    return self._manifest
-            except Exception as e:
-                print(f"Error loading cached manifest: {e}")
+                mtime = LEGACY_MANIFEST_FILE.stat().st_mtime
+                self._save_manifest()
+                # Keep the original age so the cache still expires on schedule
+                os.utime(MANIFEST_FILE, (mtime, mtime))
+            LEGACY_MANIFEST_FILE.unlink()
+        except Exception:
+            pass  # An unreadable legacy cache is simply refetched
+
+    def _read_cached_manifest(self) -> Optional[Dict]:
+        """Read the manifest cache file, or return None if it can't be loaded."""
+        try:
+            with open(MANIFEST_FILE, 'rb') as f:
+                manifest: Dict = pickle.load(f)
+        except Exception as e:
+            print(f"Error loading cached manifest: {e}")
+            return None
+        return manifest
 
-        # Fetch fresh manifest from API
-        return self._fetch_manifest_from_api()
+    def _load_manifest(self) -> Dict:
+        """Load manifest from cache or fetch from API."""
+        self._migrate_legacy_manifest()
+
+        cached = self._read_cached_manifest() if MANIFEST_FILE.exists() else None
+        if cached is not None and self._is_cache_valid():
+            self._manifest = cached
+            return cached
+
+        # Going to the network: templates will likely need downloading too
+        self._prewarm_dns()
+
+        # Fetch fresh manifest from API (a no-op if the cached one is unchanged)
+        manifest = self._fetch_manifest_from_api(cached)
+        if not manifest and cached is not None:
+            # Fall back to the stale cached manifest when GitHub is unreachable
+            self._manifest = cached
+            return cached
+        return manifest
 
-    def _fetch_manifest_from_api(self) -> Dict:
-        """Fetch and cache the template manifest from GitHub API."""
+    def _fetch_manifest_from_api(self, cached: Optional[Dict] = None) -> Dict:
+        """
+        Fetch and cache the template manifest from GitHub API.
+        Args:
+            cached: Expired cached manifest; if its root listing ETag still matches,
+                it is reused instead of crawling the repository again
+        """
         print("Fetching template list from GitHub...")
         
-        # Fetch root templates
-        root_data = self._fetch_from_api(GITHUB_API_BASE)
-        if not root_data:
+        # Fetch root templates. The listing includes the tree SHAs of Global/ and
+        # community/, so its ETag changes whenever any template is added or removed.
+        headers = {}
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        result = self._fetch_response(GITHUB_API_BASE, headers)
+        if result is None:
+            return {}
+
+        response, body = result
+        if response.status == 304 and cached is not None:
+            # Unchanged upstream: keep the cached manifest and restart its validity period
+            try:
+                os.utime(MANIFEST_FILE)
+            except OSError:
+                pass
+            self._manifest = cached
+            return cached
+        if response.status != 200:
+            print(f"Error fetching from GitHub: HTTP {response.status} {response.reason}")
             return {}
 
+        root_templates = self._parse_listing(body)
+        if not root_templates:
+            return {}
+
+        # Each category maps template name -> repository path. The download URL
+        # and category are derived from these, so they are not stored per entry.
         manifest = {
             'root': {},
             'Global': {},
             'community': {},
-            'timestamp': datetime.now().isoformat()
+            'timestamp': time.time(),
+            'etag': response.getheader('ETag')
         }
 
-        try:
-            root_templates = json.loads(root_data)
-            for item in root_templates:
-                if item['type'] == 'file' and item['name'].endswith('.gitignore'):
-                    template_name = item['name'].replace('.gitignore', '')
-                    manifest['root'][template_name] = {
-                        'path': f"{item['name']}",
-                        'download_url': item['download_url'],
-                        'category': 'root'
-                    }
-        except json.JSONDecodeError:
-            pass
+        for item in root_templates:
+            if item['type'] == 'file' and item['name'].endswith('.gitignore'):
+                template_name = item['name'].replace('.gitignore', '')
+                manifest['root'][template_name] = item['name']
 
-        # Fetch Global templates
+        # Fetch Global and community folder listings
+        listings = {}
+        complete = True
         for subfolder in ['Global', 'community']:
-            subfolder_data = self._fetch_from_api(f"{GITHUB_API_BASE}/{subfolder}")
-            if not subfolder_data:
-                continue
+            items = self._fetch_listing(f"{GITHUB_API_BASE}/{subfolder}")
+            if items is None:
+                complete = False
+            elif items:
+                listings[subfolder] = items
+
+        # Fetch all subdirectory listings concurrently, they are independent round trips
+        from concurrent.futures import ThreadPoolExecutor
+
+        subdir_urls = [
+            item['url']
+            for items in listings.values()
+            for item in items
+            if item['type'] == 'dir'
+        ]
+        with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+            subdir_results = dict(zip(subdir_urls, executor.map(self._fetch_listing, subdir_urls)))
+        if any(items is None for items in subdir_results.values()):
+            complete = False
+
+        # Merge in listing order so the manifest layout is deterministic
+        for subfolder, items in listings.items():
+            for item in items:
+                if item['type'] == 'dir':
+                    # Contents of subdirectory
+                    for sub_item in subdir_results.get(item['url']) or []:
+                        if sub_item['type'] == 'file' and sub_item['name'].endswith('.gitignore'):
+                            template_name = sub_item['name'].replace('.gitignore', '')
+                            full_name = f"{subfolder}/{item['name']}/{template_name}"
+                            manifest[subfolder][full_name] = f"{subfolder}/{item['name']}/{sub_item['name']}"
+                elif item['type'] == 'file' and item['name'].endswith('.gitignore'):
+                    template_name = item['name'].replace('.gitignore', '')
+                    full_name = f"{subfolder}/{template_name}"
+                    manifest[subfolder][full_name] = f"{subfolder}/{item['name']}"
 
-            try:
-                items = json.loads(subfolder_data)
-                for item in items:
-                    if item['type'] == 'dir':
-                        # Fetch contents of subdirectory
-                        subdir_data = self._fetch_from_api(item['url'])
-                        if subdir_data:
-                            try:
-                                sub_items = json.loads(subdir_data)
-                                for sub_item in sub_items:
-                                    if sub_item['type'] == 'file' and sub_item['name'].endswith('.gitignore'):
-                                        template_name = sub_item['name'].replace('.gitignore', '')
-                                        full_name = f"{subfolder}/{item['name']}/{template_name}"
-                                        manifest[subfolder][full_name] = {
-                                            'path': f"{subfolder}/{item['name']}/{sub_item['name']}",
-                                            'download_url': sub_item['download_url'],
-                                            'category': subfolder
-                                        }
-                            except json.JSONDecodeError:
-                                pass
-                    elif item['type'] == 'file' and item['name'].endswith('.gitignore'):
-                        template_name = item['name'].replace('.gitignore', '')
-                        full_name = f"{subfolder}/{template_name}"
-                        manifest[subfolder][full_name] = {
-                            'path': f"{subfolder}/{item['name']}",
-                            'download_url': item['download_url'],
-                            'category': subfolder
-                        }
-            except json.JSONDecodeError:
-                pass
+        if not complete:
+            # A partial crawl (e.g. rate limited midway) must not be revalidated
+            # by the root ETag, or it would be kept until the root listing changes
+            manifest['etag'] = None
 
+        self._index_names(manifest)
         self._manifest = manifest
         self._save_manifest()
         return manifest
@@ -149,8 +441,8 @@ class TemplateManager:
     def _save_manifest(self) -> None:
         """Save manifest to cache file."""
         try:
-            with open(MANIFEST_FILE, 'w') as f:
-                json.dump(self._manifest, f, indent=2)
+            self._ensure_cache_dir()
+            _atomic_write(MANIFEST_FILE, pickle.dumps(self._manifest, protocol=5))
         except Exception as e:
             print(f"Warning: Could not save manifest cache: {e}")
 
@@ -160,22 +452,58 @@ class TemplateManager:
             self._manifest = self._load_manifest()
         return self._manifest
 
-    def _build_search_index(self) -> Dict[str, List[str]]:
-        """Build a searchable index of all templates (lowercase for fuzzy matching)."""
+    @staticmethod
+    def _index_names(manifest: Dict) -> None:
+        """
+        Store flat lists of all template names (original and lowercased) in the manifest.
+        They are persisted with the cache so searches never re-normalize names.
+        """
+        names = []
+        for category in ['root', 'Global', 'community']:
+            templates = manifest.get(category, {})
+            for name, info in templates.items():
+                if isinstance(info, dict):
+                    # Older manifests stored {'path', 'download_url', 'category'} per template
+                    templates[name] = info.get('path')
+            names.extend(templates.keys())
+
+        manifest['names'] = names
+        manifest['names_lower'] = [name.lower() for name in names]
+
+    def _ensure_name_index(self) -> None:
+        """Load the name lookups if they haven't been loaded yet."""
+        if not self._name_index_loaded:
+            self._load_name_index()
+
+    def _load_name_index(self) -> None:
+        """Load the name lookups used by search, resolution, and content fetching."""
         manifest = self.get_manifest()
-        index = {}
-        
+        if 'names_lower' not in manifest:
+            # Manifest cached by an older version
+            self._index_names(manifest)
+
+        self._names = manifest['names']
+        self._names_lower = manifest['names_lower']
+
+        # All lowercased names in one newline-separated buffer plus the offset
+        # where each name starts, so a query is located with C-level str.find
+        # calls and mapped back to its name with bisect
+        self._names_blob = '\n'.join(self._names_lower)
+        self._name_offsets = []
+        offset = 0
+        for name_lower in self._names_lower:
+            self._name_offsets.append(offset)
+            offset += len(name_lower) + 1
+
+        self._exact_lower = {}
+        for name, name_lower in zip(self._names, self._names_lower):
+            # Keep the first occurrence, matching category precedence
+            self._exact_lower.setdefault(name_lower, name)
+
+        self._by_name = {}
         for category in ['root', 'Global', 'community']:
-            for full_name in manifest.get(category, {}):
-                # Index by full name and individual parts
-                parts = full_name.lower().split('/')
-                for part in parts:
-                    if part not in index:
-                        index[part] = []
-                    if full_name not in index[part]:
-                        index[part].append(full_name)
-        
-        return index
+            self._by_name.update(manifest.get(category, {}))
+        self._name_index_loaded = True
 
     def search_templates(self, query: str) -> List[str]:
         """
@@ -185,73 +513,229 @@ class TemplateManager:
         if not query.strip():
             return []
 
-        manifest = self.get_manifest()
-        query_lower = query.lower()
-        results = []
+        self._ensure_name_index()
 
-        # Collect all templates
-        all_templates = []
-        for category in ['root', 'Global', 'community']:
-            all_templates.extend(manifest.get(category, {}).keys())
+        query_lower = query.lower()
 
         # Exact match (case-insensitive)
-        for template in all_templates:
-            if template.lower() == query_lower:
-                return [template]
+        exact = self._exact_lower.get(query_lower)
+        if exact is not None:
+            return [exact]
+
+        if '\n' in query_lower:
+            return []
+
+        # Prefix matches rank before partial matches (any part contains query).
+        # Only names containing the query are visited: each hit is mapped to its
+        # name, classified by where the first occurrence is, then the search
+        # resumes at the next name.
+        prefix_matches = []
+        partial_matches = []
+        blob = self._names_blob
+        offsets = self._name_offsets
+        pos = blob.find(query_lower)
+        while pos != -1:
+            idx = bisect_right(offsets, pos) - 1
+            if pos == offsets[idx]:
+                prefix_matches.append(self._names[idx])
+            else:
+                partial_matches.append(self._names[idx])
+            if idx + 1 == len(offsets):
+                break
+            pos = blob.find(query_lower, offsets[idx + 1])
+
+        return prefix_matches + partial_matches
+
+    def search_templates_multi(self, queries: List[str]) -> Dict[str, List[str]]:
+        """
+        Search for several queries at once.
+        Gives the same results as calling search_templates for each query, but
+        the name list is scanned once with a single compiled pattern.
+        Returns a dict of query to its list of matching template full names.
+        """
+        self._ensure_name_index()
+
+        results: Dict[str, List[str]] = {}
+        pending: Dict[str, List[str]] = {}  # Lowercased query -> original queries
+        for query in queries:
+            results[query] = []
+            query_lower = query.lower()
+            if not query.strip() or '\n' in query_lower:
+                continue
 
-        # Prefix match
-        for template in all_templates:
-            if template.lower().startswith(query_lower):
-                results.append(template)
+            # Exact match (case-insensitive)
+            exact = self._exact_lower.get(query_lower)
+            if exact is not None:
+                results[query] = [exact]
+            else:
+                pending.setdefault(query_lower, []).append(query)
+
+        if not pending:
+            return results
+
+        # Names matching none of the queries are rejected by one C-level
+        # search; only hits are checked against each query for ranking
+        pattern = re.compile('|'.join(map(re.escape, pending)))
+        prefix_matches: Dict[str, List[str]] = {query_lower: [] for query_lower in pending}
+        partial_matches: Dict[str, List[str]] = {query_lower: [] for query_lower in pending}
+        for name, name_lower in zip(self._names, self._names_lower):
+            if pattern.search(name_lower) is None:
+                continue
+            for query_lower in pending:
+                pos = name_lower.find(query_lower)
+                if pos == 0:
+                    prefix_matches[query_lower].append(name)
+                elif pos > 0:
+                    partial_matches[query_lower].append(name)
 
-        # Partial match (any part contains query)
-        for template in all_templates:
-            if query_lower in template.lower() and template not in results:
-                results.append(template)
+        for query_lower, original_queries in pending.items():
+            for query in original_queries:
+                results[query] = prefix_matches[query_lower] + partial_matches[query_lower]
 
         return results
 
     def get_template_content(self, template_name: str) -> Optional[str]:
         """
         Get the content of a template.
-        First checks cache, then fetches from GitHub if needed.
+        Memoized per session; otherwise checks cache, then fetches from GitHub if needed.
         """
-        manifest = self.get_manifest()
-        
-        # Find template in manifest
-        template_info = None
-        for category in ['root', 'Global', 'community']:
-            if template_name in manifest.get(category, {}):
-                template_info = manifest[category][template_name]
-                break
+        content = self._content_cache.get(template_name)
+        if content is None:
+            content = self._load_template_content(template_name)
+            if content is not None:
+                self._content_cache[template_name] = content
+        return content
+
+    def get_template_contents(self, template_names: List[str]) -> Dict[str, str]:
+        """
+        Get the contents of several templates at once.
+        Cached templates are read directly; the rest are downloaded concurrently.
+        Returns a dict of template name to content, omitting templates that
+        are unknown or could not be fetched.
+        """
+        contents = {}
+        to_download = []
+        for template_name in dict.fromkeys(template_names):
+            content = self._content_cache.get(template_name)
+            if content is None and self._template_path(template_name):
+                content = self._read_template_cache(template_name)
+                if content is None:
+                    to_download.append(template_name)
+                    continue
+            if content is not None:
+                contents[template_name] = content
+
+        if to_download:
+            from concurrent.futures import ThreadPoolExecutor
+
+            # Downloads are dominated by network latency, overlap them
+            with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+                downloaded = executor.map(self._download_template, to_download)
+                for template_name, content in zip(to_download, downloaded):
+                    if content is not None:
+                        contents[template_name] = content
+
+        self._content_cache.update(contents)
+        return contents
+
+    @staticmethod
+    def _read_cached_template(cache_file: Path) -> Optional[str]:
+        """
+        Read a cached template, or return None if it can't be read.
+        The file holds the exact bytes downloaded (gzipped unless it was cached
+        by an older version), so it is read in binary and decoded in one step,
+        skipping the text layer's newline translation.
+        """
+        try:
+            data = cache_file.read_bytes()
+            if cache_file.suffix == '.gz':
+                return gzip.decompress(data).decode('utf-8')
+            # Older versions wrote the cache in text mode, with '\r\n' on Windows
+            return data.decode('utf-8').replace('\r\n', '\n')
+        except Exception:
+            return None
+
+    def _write_cached_template(self, cache_file: Path, content: str) -> None:
+        """Compress a template and write it to the disk cache."""
+        self._ensure_cache_dir()
+        data = gzip.compress(content.encode('utf-8'), compresslevel=TEMPLATE_COMPRESS_LEVEL)
+        _atomic_write(cache_file, data)
+
+    def _template_path(self, template_name: str) -> Optional[str]:
+        """Return the repository path of a template, or None if it is unknown."""
+        self._ensure_name_index()
+        return self._by_name.get(template_name)
 
-        if not template_info:
+    def _template_cache_file(self, template_name: str) -> Path:
+        """
+        Return the disk cache location of a template.
+        Older versions cached templates uncompressed, at this path without '.gz'.
+        """
+        return TEMPLATES_CACHE_DIR / f"{template_name.replace('/', '_')}.gitignore.gz"
+
+    def _read_template_cache(self, template_name: str) -> Optional[str]:
+        """Return a template from the disk cache if the cached copy is still valid."""
+        cache_file = self._template_cache_file(template_name)
+        if self._is_cache_valid(cache_file):
+            return self._read_cached_template(cache_file)
+
+        # Uncompressed copy cached by an older version
+        legacy_file = cache_file.with_suffix('')
+        if not self._is_cache_valid(legacy_file):
             return None
 
-        # Check cache first
-        cache_file = TEMPLATES_CACHE_DIR / f"{template_name.replace('/', '_')}.gitignore"
-        if cache_file.exists():
+        content = self._read_cached_template(legacy_file)
+        if content is not None:
+            # Rewrite it compressed, keeping its age so it still expires on time
             try:
-                with open(cache_file, 'r') as f:
-                    return f.read()
-            except Exception:
+                mtime = legacy_file.stat().st_mtime
+                self._write_cached_template(cache_file, content)
+                os.utime(cache_file, (mtime, mtime))
+                legacy_file.unlink()
+            except OSError:
                 pass
+        return content
 
-        # Fetch from GitHub
-        download_url = template_info.get('download_url')
-        if not download_url:
-            # Build URL manually
-            download_url = f"{GITHUB_RAW_BASE}/{template_info['path']}"
+    def _load_template_content(self, template_name: str) -> Optional[str]:
+        """Read a template from the disk cache or fetch it from GitHub."""
+        # Find template in manifest
+        if not self._template_path(template_name):
+            return None
+
+        # Check cache first
+        content = self._read_template_cache(template_name)
+        if content is not None:
+            return content
+
+        return self._download_template(template_name)
+
+    def _download_template(self, template_name: str) -> Optional[str]:
+        """
+        Fetch a template from GitHub and cache it.
+        Falls back to a stale cached copy when GitHub is unreachable.
+        """
+        from urllib.parse import quote
+
+        template_path = self._template_path(template_name)
+        if not template_path:
+            return None
+
+        cache_file = self._template_cache_file(template_name)
+        download_url = f"{GITHUB_RAW_BASE}/{quote(template_path)}"
 
         content = self._fetch_from_api(download_url)
         
         if content:
             # Cache the content
             try:
-                with open(cache_file, 'w') as f:
-                    f.write(content)
+                self._write_cached_template(cache_file, content)
             except Exception:
                 pass
+        else:
+            # Fall back to the stale cached copy when GitHub is unreachable
+            for stale_file in (cache_file, cache_file.with_suffix('')):
+                if stale_file.exists():
+                    return self._read_cached_template(stale_file)
         
         return content
 
@@ -270,13 +754,12 @@ class TemplateManager:
         Handles ambiguous names by suggesting options.
         Returns the resolved template name or None if not found.
         """
-        manifest = self.get_manifest()
-        
+        self._ensure_name_index()
+
         # Exact match (case-insensitive)
-        for category in ['root', 'Global', 'community']:
-            for full_name in manifest.get(category, {}):
-                if full_name.lower() == template_name.lower():
-                    return full_name
+        exact = self._exact_lower.get(template_name.lower())
+        if exact is not None:
+            return exact
 
         # Search for matches
         matches = self.search_templates(template_name)
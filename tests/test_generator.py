@@ -54,6 +54,68 @@ class TestGitignoreGenerator:
             assert "__pycache__/" in result
             assert "test-results/" in result
 
+    def test_failed_append_keeps_existing_file(self):
+        """Test that an error while writing leaves the existing .gitignore intact"""
+        from unittest import mock
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / ".gitignore"
+            output.write_text("my-rule/\n")
+            gen = GitignoreGenerator(str(output))
+            
+            def write_partially(out, *args, **kwargs):
+                out.write("partial")
+                raise OSError("disk full")
+            
+            with mock.patch.object(gen, 'write_templates', side_effect=write_partially):
+                success, message = gen.generate([("Python", "*.pyc\n")], merge_strategy='append')
+            
+            assert not success
+            assert "disk full" in message
+            assert output.read_text() == "my-rule/\n"
+            assert list(Path(tmpdir).iterdir()) == [output]
+
+    def test_repeated_rule_after_negation_kept(self):
+        """Test that a repeated rule following a negation is not dropped"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gen = GitignoreGenerator(str(Path(tmpdir) / ".gitignore"))
+            
+            templates = [
+                ("A", "*.log\n"),
+                ("B", "!debug.log\n*.log\n"),  # *.log re-ignores debug.log
+            ]
+            
+            result = gen.merge_templates(templates)
+            
+            assert "!debug.log\n*.log\n" in result
+            
+            # Same against the user's existing rules in append mode
+            result = gen.merge_templates(templates[1:], preserve_existing=True, existing_content="*.log\n")
+            
+            assert "!debug.log\n*.log\n" in result
+
+    def test_fully_duplicate_template_skipped(self):
+        """Test that a template whose rules are all covered gets no section"""
+        gen = GitignoreGenerator()
+        
+        templates = [
+            ("Python", "*.pyc\n__pycache__/\n"),
+            ("Cache", "# Only duplicates\n__pycache__/\n"),
+        ]
+        
+        result = gen.merge_templates(templates)
+        
+        assert "##### Python #####" in result
+        assert "##### Cache #####" not in result
+
+    def test_extract_rules(self):
+        """Test that comments, blanks, and surrounding whitespace are ignored"""
+        gen = GitignoreGenerator()
+        
+        content = "# comment\n\n  *.pyc  \r\n\t# indented comment\nbuild/\r\n!keep.txt\n"
+        
+        assert gen._extract_rules(content) == {"*.pyc", "build/", "!keep.txt"}
+
     def test_generate_creates_file(self):
         """Test that generate creates a .gitignore file"""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -91,6 +153,25 @@ class TestGitignoreGenerator:
             assert "existing_rule/" in content
             assert "*.pyc" in content
 
+    def test_generate_append_uses_given_content(self):
+        """Test append mode reuses already-read content instead of the file"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gitignore_path = Path(tmpdir) / ".gitignore"
+            gitignore_path.write_text("on_disk/\n")
+            
+            gen = GitignoreGenerator(str(gitignore_path))
+            
+            success, message = gen.generate(
+                [("Python", "*.pyc\n")],
+                merge_strategy='append',
+                existing_content="already_read/\n"
+            )
+            
+            assert success
+            content = gitignore_path.read_text()
+            assert "already_read/" in content
+            assert "on_disk/" not in content
+
     def test_validate_syntax(self):
         """Test .gitignore syntax validation"""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -101,3 +182,16 @@ class TestGitignoreGenerator:
             
             assert is_valid
             assert len(warnings) == 0
+
+    def test_validate_syntax_c_style_comments(self):
+        """Test that C-style comments are reported with line numbers"""
+        gen = GitignoreGenerator()
+        
+        content = "*.pyc\n// not a comment\n  /* neither */\n# fine\n"
+        is_valid, warnings = gen.validate_syntax(content)
+        
+        assert not is_valid
+        assert warnings == [
+            "Line 2: C-style comments not supported, use '#'",
+            "Line 3: Consider using '#' for comments",
+        ]
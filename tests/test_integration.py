@@ -16,3 +16,31 @@ class TestCLIIntegration:
         from gitignore_generator.templates import TemplateManager
         
         assert __version__ == "0.1.1"
+
+    def test_fetch_and_resolve_preserves_order(self):
+        """Test that batch-fetched templates keep the requested order"""
+        from unittest import mock
+
+        from gitignore_generator.cli import GitignoreGeneratorCLI
+        
+        cli = GitignoreGeneratorCLI()
+        contents = {
+            'Global/Windows': 'Thumbs.db\n',
+            'Global/macOS': '.DS_Store\n',
+            'Python': '*.pyc\n',
+        }
+        manager = mock.Mock()
+        manager.resolve_template.side_effect = lambda name: name if name in contents else None
+        manager.search_templates.return_value = []
+        manager.get_template_contents.side_effect = lambda names: {
+            name: contents[name] for name in names if name in contents
+        }
+        cli.template_manager = manager
+        
+        result = cli._fetch_and_resolve_templates(['Python', 'Missing', 'Global/macOS', 'Global/Windows'])
+        
+        assert result == [
+            ('Python', '*.pyc\n'),
+            ('Global/macOS', '.DS_Store\n'),
+            ('Global/Windows', 'Thumbs.db\n'),
+        ]
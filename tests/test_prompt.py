@@ -23,3 +23,18 @@ class TestPromptUtils:
         assert gen._normalize_template_name('Python') == 'Python'
         assert gen._normalize_template_name('Global/Windows') == 'Windows'
         assert gen._normalize_template_name('community/Python/JupyterNotebooks') == 'JupyterNotebooks'
+
+    def test_repeated_language_resolved_once(self):
+        """Test that entering the same language twice skips the second lookup"""
+        from unittest import mock
+
+        from gitignore_generator.prompt import prompt_and_resolve_languages
+        
+        manager = mock.Mock()
+        manager.resolve_template.return_value = 'Python'
+        
+        with mock.patch('builtins.input', side_effect=['Python', 'python', '']):
+            languages = prompt_and_resolve_languages(manager)
+        
+        assert languages == ['Python']
+        manager.resolve_template.assert_called_once_with('Python')